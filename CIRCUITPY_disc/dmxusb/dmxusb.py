@@ -39,7 +39,6 @@ __repo__ = "https://github.com/s-light/CircuitPython_DMXUSB.git"
 
 import time
 import struct
-import binascii
 import microcontroller
 
 from micropython import const
@@ -74,6 +73,17 @@ DEVICE_DMXUSB = {
     "UNIVERSE_IN": 0,
 }
 
+# index into _DEVICES - resolved once from the mode dict at init
+MODE_ULTRA_DMX_MICRO = const(0)
+MODE_DMXKING_UltraDMXPro = const(1)
+MODE_DMXUSB = const(2)
+
+_DEVICES = (
+    DEVICE_EMULATED_ULTRA_DMX_MICRO,
+    DEVICE_EMULATED_DMXKING_UltraDMXPro,
+    DEVICE_DMXUSB,
+)
+
 # Byte order for Enttec/DMXKing protocol
 STATE_START = const(0)
 STATE_LABEL = const(1)
@@ -105,163 +115,226 @@ LABEL_Lookup = {
     100: "LABEL_DMX_DATA2",
 }
 
-MAX_CHANNELS = 512
+# debug output - checked at compile time so the prints are removed when 0.
+_DEBUG = const(0)
 
+MAX_CHANNELS = 512
+# max number of bytes drained from the uart in one read
+RX_BUFFER_SIZE = 1024
+# recommended receiver_buffer_size for busio.UART:
+# the uart fills this ring buffer in the background -
+# it should hold at least two complete DMX messages (2 * (512 + 1 + 5) bytes)
+# so nothing is dropped while the main loop is busy.
+UART_RECEIVER_BUFFER_SIZE = 2048
 
-def format_bytearray_as_int_string(bytearray_in: bytearray) -> string:
-    in_as_str_array = [f"{x:>3d}" for x in bytearray_in]
-    return f"[{
-        ', '.join(
-        in_as_str_array
-        )
-    }]"
+# message header: start mark, label, data length (LSB first)
+# the length is plain len(data) - MSB = len(data) >> 8 (Enttec DMX USB Pro API)
+_HEADER_FORMAT = "<BBH"
 
 
 class DMXUSB:
     """DMXUSB API
 
     :param ~busio.UART uart: An instance of the UART bus connected to the chip.
-    :param int callback_dmxin: callback function - called every time a dmx transmission is received. fn(universe, buffer) (default=4)
+        create it with ``receiver_buffer_size=UART_RECEIVER_BUFFER_SIZE``
+        so it can buffer incoming data between calls to `update`.
+    :param int callback_dmxin: callback function - called every time a dmx transmission is received. fn(universe, data) (default=4)
+        ``data`` is a `memoryview` of the received channels in the internal buffer (zero-copy).
+        it is only valid during the call - it is overwritten by the next transmission.
+        use ``bytes(data)`` to keep a copy.
     :param int universes_out: number of output universes (default=1)
     :param int serial_number: device serial number '0xAABBCCDD' (default=microcontroller.cpu.uid[2:] last 4 elements from uid)
+
+    debug output is not a constructor argument -
+    set ``_DEBUG = const(1)`` at the top of this module to enable it.
     """
 
     def __init__(
         self,
         *,
         uart: UART,
-        callback_dmxin: Callable[[int, bytearray], None],
+        callback_dmxin: Callable[[int, memoryview], None],
         universes_out: int | None = None,
         serial_number: bytearray = None,
         mode=DEVICE_EMULATED_ULTRA_DMX_MICRO,
         # universes_in=1,
-        debug=False,
     ):
         """Init."""
-        self._debug = debug
         self._uart = uart
         self._mode = mode
+        # compare the mode dict only once - raises ValueError for unknown modes
+        self._mode_id = _DEVICES.index(mode)
         self._callback_dmxin = callback_dmxin
 
         self._universes_out = universes_out
         self._universes_in = 0
         if self._universes_out is None:
             self._universes_out = self._mode["UNIVERSE_OUT"]
-        if self._debug:
+        if _DEBUG:
             print(f"  _universes_out: {self._universes_out}")
 
         self._serial_number = serial_number
         if serial_number is None:
             self._serial_number = bytes(microcontroller.cpu.uid[2:])
 
+        self._build_static_frames()
+
         # self._state = STATE_START
         # self._label = LABEL_UNDEFINED
         # self._msg_length = 0
         # self._buffer_data_clear()
         # self._last_action = time.monotonic()
         self._buffer_data = bytearray(MAX_CHANNELS)
+        self._buffer_data_view = memoryview(self._buffer_data)
+        self._buffer_data_valid_len = 0
+        # scratch buffer for bulk reads from the uart
+        self._rx_scratch = bytearray(RX_BUFFER_SIZE)
+        self._rx_scratch_view = memoryview(self._rx_scratch)
         # print("self._buffer_data", self._buffer_data)
+        # order has to match the STATE_* constants
+        self._state_handlers = (
+            self._state_start,
+            self._state_label,
+            self._state_len_lsb,
+            self._state_len_msb,
+            self._state_data,
+            self._state_end,
+        )
+        # order has to match the MODE_* constants
+        self._handle_DMX_data = (
+            self._handle_DMX_data_ULTRA_DMX_MICRO,
+            self._handle_DMX_data_DMXKING_UltraDMXPro,
+            self._handle_DMX_data_DMXUSB,
+        )[self._mode_id]
+        self._label_handlers = {
+            LABEL_ESTA_ID_REQUEST: self._send_ESTA_ID,
+            LABEL_DEVICE_ID_REQUEST: self._send_DEVICE_ID,
+            LABEL_SERIAL_NUMBER_REQUEST: self._send_SERIAL_NUMBER,
+            LABEL_WIDGET_PARAMETER_REQUEST: self._send_WIDGET_PARAMETER,
+            LABEL_WIDGET_PARAMETER_EXTENDED_REQUEST: self._send_WIDGET_PARAMETER_EXTENDED,
+        }
         self._reset_receive_statemanschine()
 
         # usb_cdc.console.timeout = 1.0
 
-    def _send_message(self, label, data: bytearray) -> None:
-        _data = [
-            MSG_STARTMARK,
-            label,
-            (len(data) & 0xFF),
-            ((len(data) + 1) >> 8),
-        ]
-        _data.extend(data)
-        _data.append(MSG_ENDMARK)
-        send_bytes = self._uart.write(bytearray(_data))
-        if self._debug:
+    @staticmethod
+    def _build_frame(label: int, payload: bytes) -> bytes:
+        """Build complete message frame (start mark, label, length, payload, end mark)."""
+        return (
+            struct.pack(_HEADER_FORMAT, MSG_STARTMARK, label, len(payload))
+            + bytes(payload)
+            + bytes((MSG_ENDMARK,))
+        )
+
+    def _build_static_frames(self) -> None:
+        """Prepare the answers to all requests - they do not change at runtime."""
+        self._frame_ESTA_ID = self._build_frame(
+            LABEL_ESTA_ID_REQUEST,
+            struct.pack(">H", self._mode["ESTA_ID"]) + b"DMXUSB",
+        )
+        self._frame_DEVICE_ID = self._build_frame(
+            LABEL_DEVICE_ID_REQUEST,
+            struct.pack(">H", self._mode["DEVICE_ID"]) + self._mode["NAME"],
+        )
+        self._frame_SERIAL_NUMBER = self._build_frame(
+            LABEL_SERIAL_NUMBER_REQUEST,
+            bytes(self._serial_number),
+        )
+        self._frame_WIDGET_PARAMETER = self._build_frame(
+            LABEL_WIDGET_PARAMETER_REQUEST,
+            bytes(
+                (
+                    # firmware version LSB: 3 (v0.0.4)
+                    0x03,
+                    # firmware version MSB: 0
+                    0x00,
+                    # DMX output break time in 10.67 microsecond units: 9 (TODO: CALCUALTE WITH BAUDRATE)
+                    0x09,
+                    # DMX output Mark After Break time in 10.67 microsecond units: 1 (TODO: CALCUALTE WITH BAUDRATE)
+                    0x01,
+                    # DMX output rate in packets per second: 40 (TODO: CALCUALTE WITH BAUDRATE)
+                    0x28,
+                )
+            ),
+        )
+        self._frame_WIDGET_PARAMETER_EXTENDED = self._build_frame(
+            LABEL_WIDGET_PARAMETER_EXTENDED_REQUEST,
+            bytes(
+                (
+                    self._universes_out,  # universes_out
+                    self._universes_in,  # universes_in
+                )
+            ),
+        )
+
+    def _send_frame(self, label, frame: bytes) -> int:
+        send_bytes = self._uart.write(frame)
+        if _DEBUG:
             print(f"send '{LABEL_Lookup[label]}' ({send_bytes})")
         return send_bytes
 
     def _send_ESTA_ID(self) -> None:
-        data = []
-        data.extend(bytes(divmod(self._mode["ESTA_ID"], 0x100)))
-        data.extend(b"DMXUSB")
-        self._send_message(LABEL_ESTA_ID_REQUEST, data)
+        self._send_frame(LABEL_ESTA_ID_REQUEST, self._frame_ESTA_ID)
 
     def _send_DEVICE_ID(self) -> None:
-        data = []
-        data.extend(bytes(divmod(self._mode["DEVICE_ID"], 0x100)))
-        data.extend(self._mode["NAME"])
-        self._send_message(LABEL_DEVICE_ID_REQUEST, data)
+        self._send_frame(LABEL_DEVICE_ID_REQUEST, self._frame_DEVICE_ID)
 
     def _send_SERIAL_NUMBER(self) -> None:
-        data = []
-        data.extend(self._serial_number)
-        self._send_message(LABEL_SERIAL_NUMBER_REQUEST, data)
+        self._send_frame(LABEL_SERIAL_NUMBER_REQUEST, self._frame_SERIAL_NUMBER)
 
     def _send_WIDGET_PARAMETER(self) -> None:
-        data = [
-            # firmware version LSB: 3 (v0.0.4)
-            0x03,
-            # firmware version MSB: 0
-            0x00,
-            # DMX output break time in 10.67 microsecond units: 9 (TODO: CALCUALTE WITH BAUDRATE)
-            0x09,
-            # DMX output Mark After Break time in 10.67 microsecond units: 1 (TODO: CALCUALTE WITH BAUDRATE)
-            0x01,
-            # DMX output rate in packets per second: 40 (TODO: CALCUALTE WITH BAUDRATE)
-            0x28,
-        ]
-        self._send_message(LABEL_WIDGET_PARAMETER_REQUEST, data)
+        self._send_frame(LABEL_WIDGET_PARAMETER_REQUEST, self._frame_WIDGET_PARAMETER)
 
     def _send_WIDGET_PARAMETER_EXTENDED(self) -> None:
-        data = [
-            self._universes_out,  # universes_out
-            self._universes_in,  # universes_in
-        ]
-        self._send_message(LABEL_WIDGET_PARAMETER_EXTENDED_REQUEST, data)
+        self._send_frame(
+            LABEL_WIDGET_PARAMETER_EXTENDED_REQUEST,
+            self._frame_WIDGET_PARAMETER_EXTENDED,
+        )
 
     def _handle_DMX_data_received(self) -> None:
-        if self._debug:
+        # only pass on the channels actually received in this frame.
+        # buffer index counts the start code - DMX channels start at 1.
+        self._buffer_data_valid_len = max(self._buffer_data_index - 1, 0)
+        # one view for all callbacks of this frame - no copies.
+        data = self._buffer_data_view[: self._buffer_data_valid_len]
+        if _DEBUG:
             print("_handle_DMX_data_received()")
-            print(f"  data: {format_bytearray_as_int_string(self._buffer_data)}")
-        if (
-            self._label == LABEL_DMX_DATA
-            and self._mode == DEVICE_EMULATED_ULTRA_DMX_MICRO
-        ):
-            self._callback_dmxin(universe=0, data=self._buffer_data)
-        elif (
-            self._label == LABEL_DMX_DATA
-            and self._mode == DEVICE_EMULATED_DMXKING_UltraDMXPro
-        ):
-            self._callback_dmxin(universe=0, data=self._buffer_data)
-            self._callback_dmxin(universe=1, data=self._buffer_data)
-        elif self._label == LABEL_DMX_DATA and self._mode == DEVICE_DMXUSB:
+            print(f"  data: {bytes(data)}")
+        self._handle_DMX_data(data)
+
+    def _handle_DMX_data_ULTRA_DMX_MICRO(self, data: memoryview) -> None:
+        if self._label == LABEL_DMX_DATA:
+            self._callback_dmxin(universe=0, data=data)
+
+    def _handle_DMX_data_DMXKING_UltraDMXPro(self, data: memoryview) -> None:
+        if self._label == LABEL_DMX_DATA:
+            self._callback_dmxin(universe=0, data=data)
+            self._callback_dmxin(universe=1, data=data)
+        elif self._label == LABEL_DMX_DATA2:
+            self._callback_dmxin(universe=0, data=data)
+        elif self._label == LABEL_DMX_DATA2 + 1:
+            self._callback_dmxin(universe=1, data=data)
+
+    def _handle_DMX_data_DMXUSB(self, data: memoryview) -> None:
+        if self._label == LABEL_DMX_DATA:
             for universe_index in range(self._universes_out):
-                self._callback_dmxin(universe=universe_index, data=self._buffer_data)
-        elif (
-            self._label == LABEL_DMX_DATA2
-            and self._mode == DEVICE_EMULATED_DMXKING_UltraDMXPro
-        ):
-            self._callback_dmxin(universe=0, data=self._buffer_data)
-        elif (
-            self._label == LABEL_DMX_DATA2 + 1
-        ) and self._mode == DEVICE_EMULATED_DMXKING_UltraDMXPro:
-            self._callback_dmxin(universe=1, data=self._buffer_data)
-        elif self._mode == DEVICE_DMXUSB:
-            self._callback_dmxin(
-                universe=self._label - LABEL_DMX_DATA2, data=self._buffer_data
-            )
+                self._callback_dmxin(universe=universe_index, data=data)
+        else:
+            self._callback_dmxin(universe=self._label - LABEL_DMX_DATA2, data=data)
 
     def _buffer_data_clear(self) -> None:
+        # no need to zero the buffer -
+        # only the received part is passed on (see _buffer_data_valid_len)
         self._buffer_data_index = 0
-        self._buffer_data[:] = bytearray(len(self._buffer_data))
 
     def _label_is_DMX_receive(self) -> bool:
         return self._label == LABEL_DMX_DATA or (
             self._label >= LABEL_DMX_DATA2
-            and self._label < LABEL_DMX_DATA2 + self.universes_out
+            and self._label < LABEL_DMX_DATA2 + self._universes_out
         )
 
     def _reset_receive_statemanschine(self):
-        if self._debug:
+        if _DEBUG:
             print(f"_reset_receive_statemanschine...")
         self._state = STATE_START
         self._label = LABEL_UNDEFINED
@@ -270,69 +343,100 @@ class DMXUSB:
         self._last_action = time.monotonic()
 
     def _parse(self) -> None:
-        # if self._debug:
+        # if _DEBUG:
         #     print(
         #         f"parse: label: '{self._label}' {LABEL_Lookup[self._label]} _msg_length: '{self._msg_length}'"
         #         # f" _data_rest_count: '{self._data_rest_count}' "
         #     )
-        if self._label is LABEL_ESTA_ID_REQUEST:
-            self._send_ESTA_ID()
-        elif self._label is LABEL_DEVICE_ID_REQUEST:
-            self._send_DEVICE_ID()
-        elif self._label is LABEL_SERIAL_NUMBER_REQUEST:
-            self._send_SERIAL_NUMBER()
-        elif self._label is LABEL_WIDGET_PARAMETER_REQUEST:
-            self._send_WIDGET_PARAMETER()
-        elif self._label is LABEL_WIDGET_PARAMETER_EXTENDED_REQUEST:
-            self._send_WIDGET_PARAMETER_EXTENDED()
+        handler = self._label_handlers.get(self._label)
+        if handler:
+            handler()
         elif self._label_is_DMX_receive():
             self._handle_DMX_data_received()
 
-    def _receive_and_parse(self, b: byte) -> None:
-        # if self._debug:
-        #     print(f"{self._state} - b: {b}")
-
-        if self._state is STATE_START:
-            if b[0] == MSG_STARTMARK:
-                self._state = STATE_LABEL
-            else:
-                # ?? this should never happen?!
-                pass
-        elif self._state is STATE_LABEL:
-            self._label = b[0]
-            if self._label_is_DMX_receive():
-                self._buffer_data_clear()
-            self._state = STATE_LEN_LSB
-        elif self._state is STATE_LEN_LSB:
-            self._msg_length = b[0]
-            self._state = STATE_LEN_MSB
-        elif self._state is STATE_LEN_MSB:
-            self._msg_length |= b[0] << 8
-            if self._msg_length > 0:
-                self._state = STATE_DATA
-            else:
-                self._state = STATE_END
-            self._data_rest_count = self._msg_length
-        elif self._state is STATE_DATA:
-            if self._buffer_data_index <= len(self._buffer_data):
-                if self._buffer_data_index > 0:
-                    # add dmx data to buffer.
-                    # DMX channels start at 1. buffer starts at 0
-                    self._buffer_data[self._buffer_data_index - 1] = b[0]
-                self._buffer_data_index += 1
-            # decrease expected rest data
-            self._data_rest_count = self._data_rest_count - 1
-            if self._data_rest_count == 0:
-                self._state = STATE_END
-        elif self._state is STATE_END:
-            if b[0] == MSG_ENDMARK:
-                self._parse()
-                self._state = STATE_START
-            else:
-                # ?? this should never happen?!
-                pass
+    def _state_start(self, b: int) -> None:
+        if b == MSG_STARTMARK:
+            self._state = STATE_LABEL
         else:
+            # ?? this should never happen?!
+            pass
+
+    def _state_label(self, b: int) -> None:
+        self._label = b
+        if self._label_is_DMX_receive():
+            self._buffer_data_clear()
+        self._state = STATE_LEN_LSB
+
+    def _state_len_lsb(self, b: int) -> None:
+        self._msg_length = b
+        self._state = STATE_LEN_MSB
+
+    def _state_len_msb(self, b: int) -> None:
+        self._msg_length |= b << 8
+        if self._msg_length > 0:
+            self._state = STATE_DATA
+        else:
+            self._state = STATE_END
+        self._data_rest_count = self._msg_length
+
+    def _state_data(self, b: int) -> None:
+        if self._buffer_data_index <= len(self._buffer_data):
+            if self._buffer_data_index > 0:
+                # add dmx data to buffer.
+                # DMX channels start at 1. buffer starts at 0
+                self._buffer_data[self._buffer_data_index - 1] = b
+            self._buffer_data_index += 1
+        # decrease expected rest data
+        self._data_rest_count = self._data_rest_count - 1
+        if self._data_rest_count == 0:
+            self._state = STATE_END
+
+    def _state_end(self, b: int) -> None:
+        if b == MSG_ENDMARK:
+            self._parse()
             self._state = STATE_START
+        else:
+            # ?? this should never happen?!
+            pass
+
+    def _state_data_bulk(self, data: memoryview) -> int:
+        """Copy as much DMX data as possible in one go.
+
+        returns the number of bytes consumed from data.
+        """
+        take = min(self._data_rest_count, len(data))
+        start = 0
+        if self._buffer_data_index == 0 and take > 0:
+            # skip DMX start code - DMX channels start at 1. buffer starts at 0
+            start = 1
+            self._buffer_data_index = 1
+        buffer_offset = self._buffer_data_index - 1
+        copy_count = min(take - start, len(self._buffer_data) - buffer_offset)
+        if copy_count > 0:
+            self._buffer_data[buffer_offset : buffer_offset + copy_count] = data[
+                start : start + copy_count
+            ]
+            self._buffer_data_index += copy_count
+        # decrease expected rest data
+        self._data_rest_count = self._data_rest_count - take
+        if self._data_rest_count == 0:
+            self._state = STATE_END
+        return take
+
+    def _feed_buffer(self, data: memoryview) -> None:
+        """Feed a batch of received bytes to the parser."""
+        # local references save the attribute lookups per byte
+        state_handlers = self._state_handlers
+        state_data_bulk = self._state_data_bulk
+        index = 0
+        count = len(data)
+        while index < count:
+            state = self._state
+            if state == STATE_DATA:
+                index += state_data_bulk(data[index:])
+            else:
+                state_handlers[state](data[index])
+                index += 1
 
     def update(self) -> None:
         """listen for incoming dmx data.
@@ -342,27 +446,32 @@ class DMXUSB:
         - if package finished parse
         """
 
-        available = self._uart.in_waiting
+        # local references save the attribute lookups in the loops
+        uart = self._uart
+        monotonic = time.monotonic
+        rx_scratch_view = self._rx_scratch_view
+        feed_buffer = self._feed_buffer
+
+        available = uart.in_waiting
         while available:
-            b = self._uart.read(1)
-            self._last_action = time.monotonic()
-            self._receive_and_parse(b)
-            available = self._uart.in_waiting
-        if self._state is not STATE_START and (
-            time.monotonic() - self._last_action > 0.1
-        ):
+            count = uart.readinto(rx_scratch_view[: min(available, RX_BUFFER_SIZE)])
+            if not count:
+                break
+            self._last_action = monotonic()
+            feed_buffer(rx_scratch_view[:count])
+            available = uart.in_waiting
+        if self._state != STATE_START and (monotonic() - self._last_action > 0.1):
             self._reset_receive_statemanschine()
 
-        available = usb_cdc.console.in_waiting
-        while available:
-            raw = usb_cdc.console.read(1)
-            # print(raw)
-            if raw != b"\r":
-                send_bytes = self._uart.write(raw)
-                print("send", raw)
-            else:
-                print()
-            available = usb_cdc.console.in_waiting
+        console = usb_cdc.console
+        available = console.in_waiting
+        if available:
+            # pass typed / pasted text through to the uart in one write
+            raw = console.read(available).replace(b"\r", b"")
+            if raw:
+                send_bytes = uart.write(raw)
+                if _DEBUG:
+                    print("send", raw, f"({send_bytes})")
 
         # if available:
         #     raw = usb_cdc.console.readline()
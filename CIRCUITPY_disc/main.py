@@ -17,15 +17,23 @@ midi = adafruit_midi.MIDI(midi_out=usb_midi.ports[1], out_channel=midi_channel -
 
 midi_cc_fader0 = 1  # was const(1)
 fader0 = analogio.AnalogIn(board.IO4)
+# nanoseconds between fader reads (20ms)
+fader_update_interval_ns = 20_000_000
+# last value sent via MIDI - only send changes
+fader0_last_value = -1
 
 
 def callback_dmxin_fn(universe, data):
-    print("universe", universe, "data", data)
+    print("universe", universe, "data", bytes(data))
 
 # uart = busio.UART(board.TX, board.RX, baudrate=3000000, receiver_buffer_size=2048)
-uart = busio.UART(board.TX, board.RX, baudrate=115200, receiver_buffer_size=2048)
+uart = busio.UART(
+    board.TX,
+    board.RX,
+    baudrate=115200,
+    receiver_buffer_size=dmxusb.UART_RECEIVER_BUFFER_SIZE,
+)
 dmxusb = dmxusb.DMXUSB(
-    debug = True,
     # uart=usb_cdc.console,
     # uart=board.UART(),
     uart=uart,
@@ -36,28 +44,27 @@ dmxusb = dmxusb.DMXUSB(
 
 
 def map_range_constrained_int_analog_midi(x):
-    """Map value from analog 0..1023 range to 0..127 - constrain input range."""
-    if x < 0:
-        x = 0
-    elif x > 65536:
-        x = 65536
-    return int(x * 127 // 65536)
+    """Map value from analog 0..65535 range to 0..127 - constrain input range."""
+    if x <= 0:
+        return 0
+    if x >= 65535:
+        return 127
+    return (x * 127) >> 16
 
 
 def update_fader():
-    value = map_range_constrained_int_analog_midi(fader0.value)
-    print(f"{fader0.value:>5d}, {value:>3d}, {(fader0.value * 3.3) / 65536:>0.3f}V")
-    midi.send(
-        ControlChange(
-            midi_cc_fader0,
-            value,
+    global fader0_last_value
+    raw = fader0.value
+    value = map_range_constrained_int_analog_midi(raw)
+    if value != fader0_last_value:
+        print(f"{raw:>5d}, {value:>3d}, {(raw * 3.3) / 65536:>0.3f}V")
+        midi.send(
+            ControlChange(
+                midi_cc_fader0,
+                value,
+            )
         )
-    )
-
-
-def loop():
-    # update_fader()
-    dmxusb.update()
+        fader0_last_value = value
 
 
 def main():
@@ -70,9 +77,13 @@ def main():
     print("board: " + board.board_id)
     print(42 * "*")
 
+    fader_next_update = 0
     while True:
-        loop()
-        # time.sleep(0.5)
+        dmxusb.update()
+        now = time.monotonic_ns()
+        if now >= fader_next_update:
+            update_fader()
+            fader_next_update = now + fader_update_interval_ns
 
 
 main()
@@ -23,17 +23,18 @@ fader0 = analogio.AnalogIn(board.IO4)
 
 
 def map_range_constrained_int_analog_midi(x):
-    """Map value from analog 0..1023 range to 0..127 - constrain input range."""
-    if x < 0:
-        x = 0
-    elif x > 65536:
-        x = 65536
-    return int(x * 127 // 65536)
+    """Map value from analog 0..65535 range to 0..127 - constrain input range."""
+    if x <= 0:
+        return 0
+    if x >= 65535:
+        return 127
+    return (x * 127) >> 16
 
 
 def update_fader():
-    value = map_range_constrained_int_analog_midi(fader0.value)
-    print(f"{fader0.value:>5d}, {value:>3d}, {(fader0.value * 3.3) / 65536:>0.3f}V")
+    raw = fader0.value
+    value = map_range_constrained_int_analog_midi(raw)
+    print(f"{raw:>5d}, {value:>3d}, {(raw * 3.3) / 65536:>0.3f}V")
     midi.send(
         ControlChange(
             midi_cc_fader0,